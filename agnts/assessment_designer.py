@@ -1,6 +1,7 @@
 from __future__ import annotations
-from typing import Dict, Any, List
-import random, json
+from typing import Dict, Any, List, Iterable, Optional, Tuple
+from collections import Counter, defaultdict
+import random, json, os, heapq, tempfile
 
 DEFAULT_RUBRIC = [
     {"name":"Problem-solving approach","weight":40,"criteria":["Decomposition","Trade-offs","Testing strategy"]},
@@ -46,14 +47,211 @@ ROLE_BANK = {
   }
 }
 
+QUESTION_BANK_PATH = "data/question_bank.json"
+EXPOSURE_LEDGER_PATH = "data/question_exposure.json"
+
+LEVEL_DIFFICULTY = {"Junior": "Easy", "Mid": "Medium", "Senior": "Hard"}
+DIFFICULTY_RANK = {"Easy": 0, "Medium": 1, "Hard": 2}
+
 def _pick(lst: List[str], k:int=1) -> List[str]:
     if k>=len(lst): return lst[:]
     return random.sample(lst, k)
 
-def generate_assessment(profile: Dict[str, Any], role: str, level: str="Mid") -> Dict[str, Any]:
+class QuestionBank:
+    """Question bank with an inverted tag index per (role, kind, level).
+
+    Each question is a dict with id, role, kind (coding/system_design), levels,
+    difficulty, tags and prompt. Postings are keyed by (role, kind, level, tag) and
+    every (role, kind, level) pool is kept pre-ordered by closeness to the level's
+    difficulty, so selection touches only the requested skills' postings plus at
+    most |exclude| + k pool entries -- never the whole bank. A pool too small for k
+    is widened to the same role and kind at other levels, closest difficulty first.
+    """
+
+    def __init__(self, questions: Iterable[Dict[str, Any]]):
+        self.questions: Dict[str, Dict[str, Any]] = {}
+        self.tag_index: Dict[tuple, List[str]] = defaultdict(list)
+        self.pools: Dict[tuple, List[str]] = defaultdict(list)
+        for q in questions:
+            qid = q["id"]
+            self.questions[qid] = q
+            for level in q.get("levels") or LEVEL_DIFFICULTY:
+                pool = (q["role"], q["kind"], level)
+                self.pools[pool].append(qid)
+                for t in q.get("tags", []):
+                    self.tag_index[pool + (t.lower(),)].append(qid)
+        for (role, kind, level), ids in self.pools.items():
+            ids.sort(key=lambda qid: (self._difficulty_gap(qid, level), qid))
+        self.pool_sets = {pool: set(ids) for pool, ids in self.pools.items()}
+        self.kind_sets: Dict[tuple, set] = defaultdict(set)
+        for (role, kind, _), ids in self.pools.items():
+            self.kind_sets[(role, kind)].update(ids)
+
+    @classmethod
+    def load(cls, path: str) -> "QuestionBank":
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def roles(self) -> List[str]:
+        return sorted({role for role, _, _ in self.pools})
+
+    def _difficulty_gap(self, qid: str, level: str) -> int:
+        target = DIFFICULTY_RANK.get(LEVEL_DIFFICULTY.get(level, "Medium"), 1)
+        return abs(DIFFICULTY_RANK.get(self.questions[qid].get("difficulty"), 1) - target)
+
+    def _widened(self, role: str, kind: str, level: str):
+        """The (role, kind, level) pool in order, then the role's other levels by difficulty gap."""
+        yield from self.pools.get((role, kind, level), ())
+        own = self.pool_sets.get((role, kind, level), set())
+        others = self.kind_sets.get((role, kind), set()) - own
+        yield from sorted(others, key=lambda qid: (self._difficulty_gap(qid, level), qid))
+
+    def select(self, role: str, kind: str, level: str, skills: List[str], k: int,
+               exposed: Optional[Dict[str, int]] = None) -> List[Dict[str, Any]]:
+        """Top-k questions by skill-tag overlap, ties broken by closeness to the level's difficulty.
+
+        exposed maps already-seen question ids to how recently they were seen (higher =
+        more recent). They are skipped while fresh questions remain; if fewer than k
+        fresh ones exist, the rest is topped up with repeats, least recently seen first.
+        """
+        exposed = exposed or {}
+        pool = (role, kind, level)
+        overlap = Counter()
+        for s in {s.lower() for s in skills}:
+            for qid in self.tag_index.get(pool + (s,), ()):
+                overlap[qid] += 1
+        def key(qid):
+            return (-overlap[qid], self._difficulty_gap(qid, level), qid)
+        picked = heapq.nsmallest(k, [qid for qid in overlap if qid not in exposed], key=key)
+        if len(picked) < k:
+            # not enough tag matches: walk the pre-ordered pool, then adjacent levels,
+            # skipping seen/picked ids
+            chosen = set(picked)
+            for qid in self._widened(role, kind, level):
+                if len(picked) >= k:
+                    break
+                if qid not in chosen and qid not in exposed:
+                    picked.append(qid)
+                    chosen.add(qid)
+        if len(picked) < k:
+            own = self.pool_sets.get(pool, set())
+            members = self.kind_sets.get((role, kind), set())
+            repeats = [qid for qid in exposed if qid in members and qid not in picked]
+            picked += heapq.nsmallest(k - len(picked), repeats,
+                                      key=lambda qid: (qid not in own, exposed[qid]) + key(qid))
+        return [self.questions[qid] for qid in picked]
+
+_BANK_CACHE: Dict[str, tuple] = {}
+
+def load_question_bank(path: str = QUESTION_BANK_PATH) -> Optional[QuestionBank]:
+    """Load (and cache per file mtime) the question bank; None if the file is missing."""
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+    cached = _BANK_CACHE.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    bank = QuestionBank.load(path)
+    _BANK_CACHE[path] = (mtime, bank)
+    return bank
+
+def exposure_keys(profile: Dict[str, Any], cohort: Optional[str]) -> List[str]:
+    keys = []
+    if profile.get("id"):
+        keys.append(f"candidate:{profile['id']}")
+    if cohort:
+        keys.append(f"cohort:{cohort}")
+    return keys
+
+def load_exposure(path: str = EXPOSURE_LEDGER_PATH) -> Dict[str, List[str]]:
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def exposure_recency(ledger: Dict[str, List[str]], keys: List[str]) -> Dict[str, int]:
+    """Question id -> recency rank across the given ledger keys (higher = seen more recently)."""
+    recency: Dict[str, int] = {}
+    for key in keys:
+        for i, qid in enumerate(ledger.get(key, [])):
+            recency[qid] = max(recency.get(qid, -1), i)
+    return recency
+
+def note_exposure(ledger: Dict[str, List[str]], keys: List[str], question_ids: List[str]) -> None:
+    """Move question ids to the most-recent end of each key's entry (ledger lists are oldest first)."""
+    for key in keys:
+        seen = [q for q in ledger.get(key, []) if q not in question_ids]
+        ledger[key] = seen + list(question_ids)
+
+def save_exposure(ledger: Dict[str, List[str]], path: str = EXPOSURE_LEDGER_PATH) -> None:
+    # unique temp file per writer: the CLI, the app and the service may save concurrently
+    f = tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=os.path.dirname(os.path.abspath(path)),
+                                    prefix=os.path.basename(path) + ".", suffix=".tmp", delete=False)
+    try:
+        with f:
+            json.dump(ledger, f, indent=2)
+        os.replace(f.name, path)
+    except BaseException:
+        try:
+            os.unlink(f.name)
+        except OSError:
+            pass
+        raise
+
+def merge_exposure(changes: List[Tuple[List[str], List[str]]],
+                   path: str = EXPOSURE_LEDGER_PATH) -> Dict[str, List[str]]:
+    """Re-read the ledger file, apply (keys, question_ids) changes in order and write it back.
+
+    Other processes' writes since the caller last read the file are kept. Returns the merged ledger.
+    """
+    ledger = load_exposure(path)
+    for keys, question_ids in changes:
+        note_exposure(ledger, keys, question_ids)
+    save_exposure(ledger, path)
+    return ledger
+
+def record_exposure(keys: List[str], question_ids: List[str], path: str = EXPOSURE_LEDGER_PATH) -> None:
+    """Mark question ids as just shown for the given candidate/cohort keys in the ledger file."""
+    if not keys or not question_ids:
+        return
+    merge_exposure([(keys, question_ids)], path)
+
+def _profile_skills(profile: Dict[str, Any]) -> List[str]:
+    top = [s["skill"] for s in profile.get("top_skills", [])]
+    return top or (profile.get("linkedin", {}) or {}).get("skills", [])
+
+def generate_assessment(profile: Dict[str, Any], role: str, level: str="Mid",
+                        bank: Optional[QuestionBank]=None, ledger_path: Optional[str]=None,
+                        cohort: Optional[str]=None, record: bool=True,
+                        ledger: Optional[Dict[str, List[str]]]=None) -> Dict[str, Any]:
+    """ledger: an in-memory exposure ledger used (and updated) instead of reading/writing ledger_path."""
+    n_coding = 2 if level!="Junior" else 1
+    if bank is not None and role in bank.roles():
+        skills = _profile_skills(profile)
+        keys = exposure_keys(profile, cohort)
+        in_memory = ledger is not None
+        if not in_memory:
+            ledger = load_exposure(ledger_path) if ledger_path else {}
+        exposed = exposure_recency(ledger, keys)
+        picked = bank.select(role, "coding", level, skills, n_coding, exposed) + \
+                 bank.select(role, "system_design", level, skills, 1, exposed)
+        question_ids = [q["id"] for q in picked]
+        if record and keys and (in_memory or ledger_path):
+            note_exposure(ledger, keys, question_ids)
+            if not in_memory:
+                save_exposure(ledger, ledger_path)
+        return {
+            "role": role,
+            "level": level,
+            "technical_challenges": [q["prompt"] for q in picked],
+            "question_ids": question_ids,
+            "evaluation_rubric": DEFAULT_RUBRIC,
+            "bias_mitigation_protocol": BIAS_PROTOCOL
+        }
     bank = ROLE_BANK.get(role, ROLE_BANK["AI Engineer"]
     )
-    coding = _pick(bank["coding"], 2 if level!="Junior" else 1)
+    coding = _pick(bank["coding"], n_coding)
     design = _pick(bank["system_design"], 1)
     # Slightly tailor prompts with top skills
     top_skills = [s["skill"] for s in profile.get("top_skills", [])][:5]
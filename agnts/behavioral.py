@@ -9,14 +9,17 @@ THEMES = {
     "problem_solving": ["experiment", "trade", "metric", "precision", "recall", "debug", "test", "hypothesis"]
 }
 
+# one alternation over every keyword: a single scan per transcript instead of two per keyword
+_KEYWORD_RE = re.compile(r"\b(" + "|".join(re.escape(kw) for kws in THEMES.values() for kw in kws) + r")\b")
+
 def analyze_transcript(lines: List[str]) -> Dict[str, Any]:
     text = "\n".join(lines).lower()
+    found = Counter(_KEYWORD_RE.findall(text))
     theme_hits = {k:0 for k in THEMES}
     keywords = []
     for theme, kws in THEMES.items():
-        count = sum(len(re.findall(r"\b"+re.escape(kw)+r"\b", text)) for kw in kws)
-        theme_hits[theme] = count
-        keywords.extend([kw for kw in kws if re.search(r"\b"+re.escape(kw)+r"\b", text)])
+        theme_hits[theme] = sum(found[kw] for kw in kws)
+        keywords.extend([kw for kw in kws if found[kw]])
     strengths = sorted(theme_hits.items(), key=lambda x: -x[1])
     insights = []
     if theme_hits["problem_solving"]>0:
@@ -33,3 +36,7 @@ def analyze_transcript(lines: List[str]) -> Dict[str, Any]:
         "insights": insights,
         "bias_notice": "No demographic or affinity attributes were considered; conclusions are evidence-based and limited to job-relevant behaviors."
     }
+
+def analyze_transcripts(batch: List[List[str]]) -> List[Dict[str, Any]]:
+    """Analyze several transcripts in one call (used by the service's micro-batcher)."""
+    return [analyze_transcript(lines) for lines in batch]
@@ -1,16 +1,15 @@
 from __future__ import annotations
-from typing import Dict, Any
-import pandas as pd
+from typing import Dict, Any, List, TYPE_CHECKING
+from collections import Counter
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 def load_market(path: str) -> pd.DataFrame:
+    import pandas as pd
     return pd.read_csv(path)
 
-def summarize(df: pd.DataFrame, role: str, region: str, level: str) -> Dict[str, Any]:
-    subset = df[(df['role']==role) & (df['region']==region) & (df['level']==level)]
-    if subset.empty:
-        return {"error":"No market data for selection."}
-    row = subset.iloc[0].to_dict()
-    rec_channels = sorted(df[df['role']==role]['channel_hint'].value_counts().index[:3].tolist())
+def _summary(row: Dict[str, Any], role: str, region: str, level: str, rec_channels: List[str]) -> Dict[str, Any]:
     return {
         "role": role, "region": region, "level": level,
         "compensation_LPA": {
@@ -21,3 +20,23 @@ def summarize(df: pd.DataFrame, role: str, region: str, level: str) -> Dict[str,
         "trend_yoy_pct": row["trend_yoy_pct"],
         "recommended_channels": rec_channels
     }
+
+def summarize(df: pd.DataFrame, role: str, region: str, level: str) -> Dict[str, Any]:
+    subset = df[(df['role']==role) & (df['region']==region) & (df['level']==level)]
+    if subset.empty:
+        return {"error":"No market data for selection."}
+    row = subset.iloc[0].to_dict()
+    rec_channels = sorted(df[df['role']==role]['channel_hint'].value_counts().index[:3].tolist())
+    return _summary(row, role, region, level, rec_channels)
+
+def summarize_columns(cols: Dict[str, List[Any]], role: str, region: str, level: str) -> Dict[str, Any]:
+    """summarize() over column lists (as stored in the data snapshot), without pandas."""
+    names = list(cols)
+    rows = [dict(zip(names, vals)) for vals in zip(*cols.values())]
+    row = next((r for r in rows if r['role']==role and r['region']==region and r['level']==level), None)
+    if row is None:
+        return {"error":"No market data for selection."}
+    # value_counts order: count desc, ties by first appearance; NaN is dropped
+    counts = Counter(r['channel_hint'] for r in rows if r['role']==role and r['channel_hint']==r['channel_hint'])
+    rec_channels = sorted(c for c, _ in counts.most_common(3))
+    return _summary(row, role, region, level, rec_channels)
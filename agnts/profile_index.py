@@ -0,0 +1,230 @@
+from __future__ import annotations
+from typing import Dict, Any, Callable, List, Iterable, Optional, Union
+from datetime import datetime
+import hashlib, json, os, re, tempfile
+from agents.profiler import summarize_career
+
+PROFILE_INDEX_PATH = "data/profile_index.json"
+
+def infer_role(profile):
+    if not isinstance(profile, dict):
+        return "Unknown"
+    headline = profile.get("headline")
+    if isinstance(headline, str) and headline.strip():
+        return headline.split("|")[0].strip()
+    linkedin = profile.get("linkedin", {}) or {}
+    exp = linkedin.get("experience") or []
+    if isinstance(exp, list) and exp:
+        title = exp[0].get("title")
+        if title:
+            return title
+    summary = linkedin.get("summary", "")
+    if isinstance(summary, str) and summary:
+        m = re.search(r"is (an|a)\s+([A-Za-z0-9\-\s/]+?)(?:\s+with|\.\s|$)", summary, flags=re.IGNORECASE)
+        if m:
+            return m.group(2).strip()
+    skills = linkedin.get("skills", []) or []
+    if skills:
+        return skills[0]
+    return "Unknown"
+
+def parse_years_from_summary(summary):
+    if not summary or not isinstance(summary, str):
+        return None
+    m = re.search(r"(\d+)\s*-\s*(\d+)\s*years", summary, flags=re.IGNORECASE)
+    if m:
+        try:
+            return float(int(m.group(1)))
+        except Exception:
+            pass
+    m2 = re.search(r"(\d+)\s*years", summary, flags=re.IGNORECASE)
+    if m2:
+        try:
+            return float(int(m2.group(1)))
+        except Exception:
+            pass
+    return None
+
+def compute_experience_years(profile, as_of_date=None):
+    if as_of_date is None:
+        as_of_date = datetime.now()
+    linkedin = profile.get("linkedin", {}) or {}
+    exp = linkedin.get("experience") or []
+    starts = []
+    ends = []
+    for e in exp:
+        s = e.get("start")
+        t = e.get("end")
+        if isinstance(s, str):
+            try:
+                if re.match(r"^\d{4}-\d{2}$", s):
+                    starts.append(datetime.strptime(s, "%Y-%m"))
+                elif re.match(r"^\d{4}$", s):
+                    starts.append(datetime.strptime(s, "%Y"))
+            except Exception:
+                pass
+        if isinstance(t, str):
+            try:
+                if re.match(r"^\d{4}-\d{2}$", t):
+                    ends.append(datetime.strptime(t, "%Y-%m"))
+                elif re.match(r"^\d{4}$", t):
+                    ends.append(datetime.strptime(t, "%Y"))
+            except Exception:
+                pass
+        else:
+            ends.append(as_of_date)
+    if not starts:
+        return None
+    start_dt = min(starts)
+    end_dt = max(ends) if ends else as_of_date
+    months = (end_dt.year - start_dt.year) * 12 + (end_dt.month - start_dt.month)
+    years = months / 12.0
+    return round(years, 1)
+
+def infer_level(profile):
+    linkedin = profile.get("linkedin", {}) or {}
+    summary = linkedin.get("summary", "")
+    y = parse_years_from_summary(summary)
+    if y is None:
+        y = compute_experience_years(profile)
+    if y is None:
+        return "Mid"
+    try:
+        y = float(y)
+        if y < 2:
+            return "Junior"
+        if 2 <= y < 5:
+            return "Mid"
+        return "Senior"
+    except Exception:
+        return "Mid"
+
+def content_hash(profile: Dict[str, Any]) -> str:
+    return hashlib.sha1(json.dumps(profile, sort_keys=True).encode("utf-8")).hexdigest()
+
+def derive_fields(profile: Dict[str, Any]) -> Dict[str, Any]:
+    try:
+        career = summarize_career(profile)
+    except (KeyError, TypeError, ValueError):
+        career = None
+    return {
+        "role": infer_role(profile),
+        "level": infer_level(profile),
+        "experience_years": compute_experience_years(profile),
+        "career_summary": career,
+    }
+
+class ProfileIndex:
+    """Derived fields (role, level, experience years, career summary) per profile id.
+
+    An entry is reused while the profile's content hash is unchanged. Open-ended roles
+    ("end": null) make tenure depend on today's date, so entries also record the month
+    they were computed in and are refreshed when it changes.
+    """
+
+    def __init__(self, path: Optional[str] = PROFILE_INDEX_PATH):
+        self.path = path
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        # identifies the profile source the entries were last refreshed against (see source_key)
+        self.source_key: Optional[str] = None
+        if path and os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    data = json.load(f)
+                self.entries = data["entries"]
+                self.source_key = data.get("source_key")
+            except (OSError, ValueError, KeyError, TypeError):
+                self.entries, self.source_key = {}, None
+        self._dirty = False
+        self._by_role_level: Optional[Dict[tuple, List[str]]] = None
+
+    def entry_for(self, profile: Dict[str, Any], as_of: Optional[str] = None) -> Dict[str, Any]:
+        """Indexed fields for one profile, recomputed if its content (or the month) changed."""
+        as_of = as_of or datetime.now().strftime("%Y-%m")
+        cid = profile.get("id")
+        h = content_hash(profile)
+        e = self.entries.get(cid)
+        if e is None or e.get("hash") != h or e.get("as_of") != as_of:
+            e = self.entries[cid] = {"hash": h, "as_of": as_of, **derive_fields(profile)}
+            self._dirty = True
+            self._by_role_level = None
+        return e
+
+    def update(self, profiles: Iterable[Dict[str, Any]]) -> None:
+        """Refresh entries for profiles and drop ids no longer present."""
+        as_of = datetime.now().strftime("%Y-%m")
+        seen = set()
+        for p in profiles:
+            self.entry_for(p, as_of)
+            seen.add(p.get("id"))
+        for cid in set(self.entries) - seen:
+            del self.entries[cid]
+            self._dirty = True
+            self._by_role_level = None
+
+    def _groups(self) -> Dict[tuple, List[str]]:
+        # (role, level) -> ids, rebuilt only after entries change
+        if self._by_role_level is None:
+            self._by_role_level = {}
+            for cid, e in self.entries.items():
+                self._by_role_level.setdefault((e["role"], e["level"]), []).append(cid)
+        return self._by_role_level
+
+    def save(self) -> None:
+        if not self.path or not self._dirty:
+            return
+        # unique temp file per writer, so concurrent saves cannot replace each other's temp file
+        f = tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=os.path.dirname(os.path.abspath(self.path)),
+                                        prefix=os.path.basename(self.path) + ".", suffix=".tmp", delete=False)
+        try:
+            with f:
+                json.dump({"source_key": self.source_key, "entries": self.entries}, f, indent=2)
+            os.replace(f.name, self.path)
+        except BaseException:
+            try:
+                os.unlink(f.name)
+            except OSError:
+                pass
+            raise
+        self._dirty = False
+
+    def get(self, candidate_id: str) -> Optional[Dict[str, Any]]:
+        return self.entries.get(candidate_id)
+
+    def roles(self) -> List[str]:
+        return sorted({role for role, _ in self._groups()})
+
+    def filter(self, role: Optional[str] = None, level: Optional[str] = None) -> List[str]:
+        """Candidate ids matching role and/or level, e.g. filter("AI Engineer", "Senior")."""
+        return sorted(cid for (r, l), ids in self._groups().items()
+                      if (role is None or r == role) and (level is None or l == level) for cid in ids)
+
+def source_key(path: str) -> Optional[str]:
+    """Cheap identity of a profiles file (path, mtime, size); None if it cannot be stat'ed."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return f"{os.path.abspath(path)}:{st.st_mtime_ns}:{st.st_size}"
+
+def load_profile_index(profiles: Union[Iterable[Dict[str, Any]], Callable[[], Iterable[Dict[str, Any]]]],
+                       path: Optional[str] = PROFILE_INDEX_PATH, source: Optional[str] = None) -> ProfileIndex:
+    """Open the persisted index, refresh it against profiles and write back any changes.
+
+    source identifies the profiles' origin (source_key() of the file, or a hash of
+    uploaded bytes). When the persisted index was refreshed against the same source
+    this month, profiles are not hashed at all. profiles may be a zero-argument
+    callable, which is then only called (and the profiles loaded) on a refresh.
+    """
+    index = ProfileIndex(path)
+    key = f"{source}@{datetime.now().strftime('%Y-%m')}" if source else None
+    if key is None or index.source_key != key:
+        index.update(profiles() if callable(profiles) else profiles)
+        if index.source_key != key:
+            index.source_key = key
+            index._dirty = True
+    try:
+        index.save()
+    except OSError:
+        pass
+    return index
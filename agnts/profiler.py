@@ -50,9 +50,10 @@ def summarize_career(profile: Dict[str, Any]) -> str:
         f"Focus areas inferred from headline: {headline.split('|')[1].strip() if '|' in headline else headline}."
     )
 
-def talent_intelligence_report(profile: Dict[str, Any]) -> Dict[str, Any]:
+def talent_intelligence_report(profile: Dict[str, Any], summary: str|None = None) -> Dict[str, Any]:
+    # summary may come precomputed from the profile index
     skills = extract_skills(profile)
-    summary = summarize_career(profile)
+    summary = summary if summary is not None else summarize_career(profile)
     gh = profile.get("github",{})
     repo_highlights = sorted(gh.get("repos", []), key=lambda r: (-r.get("stars",0), r["name"]))[:3]
     return {
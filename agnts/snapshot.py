@@ -0,0 +1,218 @@
+from __future__ import annotations
+from typing import Dict, Any, List, Optional, Tuple
+from contextlib import contextmanager
+import gc, json, marshal, mmap, os, struct, sys, time
+
+# Layout: MAGIC | u32 header length | JSON header | section payloads.
+# The header records the source files (path, mtime, size) and an offset table
+# mapping every section -- and every candidate inside "profiles"/"transcripts" --
+# to (offset, length) in the file, so a single profile can be decoded without
+# touching the rest. Payloads are marshal-encoded, which is tied to the Python
+# version, so the header also records it and a mismatch counts as stale.
+MAGIC = b"MAIRSNAP"
+FORMAT_VERSION = 1
+SNAPSHOT_PATH = "data/snapshot.bin"
+
+class SnapshotError(ValueError):
+    """The file is not a snapshot, or its header or a payload is damaged."""
+
+@contextmanager
+def _gc_paused():
+    # decoding thousands of small dicts otherwise triggers repeated cyclic-GC passes
+    # over objects that cannot form cycles, which costs more than the decoding itself
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+def _runtime_tag() -> str:
+    return f"py{sys.version_info[0]}.{sys.version_info[1]}-marshal{marshal.version}"
+
+def _source_stat(path: str) -> Dict[str, Any]:
+    st = os.stat(path)
+    return {"path": os.path.abspath(path), "mtime": st.st_mtime, "size": st.st_size}
+
+def build_snapshot(profiles_path: str, transcripts_path: str, market_path: str,
+                   out_path: str = SNAPSHOT_PATH) -> Dict[str, Any]:
+    """Compile the JSON/CSV data files into a binary snapshot at out_path; returns the header."""
+    import pandas as pd
+    with open(profiles_path, encoding="utf-8") as f:
+        profiles = json.load(f)
+    with open(transcripts_path, encoding="utf-8") as f:
+        transcripts = json.load(f)
+    df = pd.read_csv(market_path)
+    # columnar: one list per column, rebuilt with pd.DataFrame(columns) on load
+    market = {c: df[c].tolist() for c in df.columns}
+
+    blobs: List[bytes] = []
+    pos = 0
+    def add(obj) -> List[int]:
+        nonlocal pos
+        b = marshal.dumps(obj)
+        blobs.append(b)
+        entry = [pos, len(b)]
+        pos += len(b)
+        return entry
+
+    header = {
+        "format_version": FORMAT_VERSION,
+        "runtime": _runtime_tag(),
+        "created": time.time(),
+        "sources": {
+            "profiles": _source_stat(profiles_path),
+            "transcripts": _source_stat(transcripts_path),
+            "market": _source_stat(market_path),
+        },
+        "profile_order": [p.get("id") for p in profiles],
+        "profiles": [add(p) for p in profiles],
+        "transcripts": {cid: add(lines) for cid, lines in transcripts.items()},
+        "market": add(market),
+    }
+    head = json.dumps(header).encode("utf-8")
+    tmp = out_path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<I", len(head)))
+        f.write(head)
+        for b in blobs:
+            f.write(b)
+    os.replace(tmp, out_path)
+    return header
+
+class Snapshot:
+    """Read-only, mmap-backed view of a snapshot file; sections are decoded on access."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # empty file
+            self._file.close()
+            raise SnapshotError(f"{path} is not a snapshot file")
+        try:
+            if self._mm[:len(MAGIC)] != MAGIC:
+                raise SnapshotError(f"{path} is not a snapshot file")
+            (n,) = struct.unpack_from("<I", self._mm, len(MAGIC))
+            start = len(MAGIC) + 4
+            with _gc_paused():
+                self.header: Dict[str, Any] = json.loads(self._mm[start:start + n])
+            self._base = start + n
+            self._profile_pos = {cid: i for i, cid in enumerate(self.header["profile_order"])}
+            if any(k not in self.header for k in ("sources", "profiles", "transcripts", "market")) \
+                    or len(self.header["profiles"]) != len(self.header["profile_order"]):
+                raise SnapshotError(f"{path} has a damaged header")
+        except (struct.error, ValueError, KeyError, TypeError) as e:
+            self.close()
+            if isinstance(e, SnapshotError):
+                raise
+            raise SnapshotError(f"{path} has a damaged header") from e
+
+    def _decode(self, entry: List[int]) -> Any:
+        try:
+            off, length = entry
+            return marshal.loads(self._mm[self._base + off:self._base + off + length])
+        except (ValueError, EOFError, TypeError) as e:
+            raise SnapshotError(f"{self.path} has a damaged payload") from e
+
+    def is_stale(self, profiles_path: str, transcripts_path: str, market_path: str) -> bool:
+        """True if the snapshot was built from other files, older contents or another runtime."""
+        h = self.header
+        if h.get("format_version") != FORMAT_VERSION or h.get("runtime") != _runtime_tag():
+            return True
+        for name, path in (("profiles", profiles_path), ("transcripts", transcripts_path), ("market", market_path)):
+            try:
+                cur = _source_stat(path)
+            except OSError:
+                return True
+            if h["sources"].get(name) != cur:
+                return True
+        return False
+
+    def profiles(self) -> List[Dict[str, Any]]:
+        with _gc_paused():
+            return [self._decode(e) for e in self.header["profiles"]]
+
+    def profile(self, candidate_id: str) -> Optional[Dict[str, Any]]:
+        i = self._profile_pos.get(candidate_id)
+        return None if i is None else self._decode(self.header["profiles"][i])
+
+    def transcripts(self) -> Dict[str, List[str]]:
+        with _gc_paused():
+            return {cid: self._decode(e) for cid, e in self.header["transcripts"].items()}
+
+    def transcript(self, candidate_id: str) -> List[str]:
+        e = self.header["transcripts"].get(candidate_id)
+        return [] if e is None else self._decode(e)
+
+    def market_columns(self) -> Dict[str, List[Any]]:
+        return self._decode(self.header["market"])
+
+    def market(self):
+        import pandas as pd
+        return pd.DataFrame(self.market_columns())
+
+    def close(self) -> None:
+        self._mm.close()
+        self._file.close()
+
+def open_snapshot(profiles_path: str, transcripts_path: str, market_path: str,
+                  snapshot_path: str = SNAPSHOT_PATH) -> Optional[Snapshot]:
+    """Open snapshot_path if it exists and is fresh for the given sources, else None."""
+    if not os.path.exists(snapshot_path):
+        return None
+    try:
+        snap = Snapshot(snapshot_path)
+    except (OSError, SnapshotError):
+        return None
+    if snap.is_stale(profiles_path, transcripts_path, market_path):
+        snap.close()
+        return None
+    return snap
+
+def load_profiles(profiles_path: str, transcripts_path: str, market_path: str,
+                  snapshot_path: Optional[str] = SNAPSHOT_PATH) -> List[Dict[str, Any]]:
+    """Only the profiles, from a fresh snapshot or else the JSON file; transcripts and market are not read."""
+    snap = open_snapshot(profiles_path, transcripts_path, market_path, snapshot_path) if snapshot_path else None
+    if snap is not None:
+        try:
+            return snap.profiles()
+        except SnapshotError:
+            pass  # damaged snapshot: read the source instead
+        finally:
+            snap.close()
+    with open(profiles_path, encoding="utf-8") as f:
+        return json.load(f)
+
+def load_data(profiles_path: str, transcripts_path: str, market_path: str,
+              snapshot_path: Optional[str] = SNAPSHOT_PATH,
+              market_columns: bool = False) -> Tuple[List[Dict[str, Any]], Dict[str, List[str]], Any]:
+    """(profiles, transcripts, market) from a fresh snapshot, falling back to JSON/CSV.
+
+    market is a DataFrame, or with market_columns=True a dict of column lists
+    (see market_intel.summarize_columns), which keeps pandas off the snapshot path.
+    """
+    if not market_columns:
+        # import before decoding so the import's GC passes don't walk every profile
+        import pandas as pd
+    snap = open_snapshot(profiles_path, transcripts_path, market_path, snapshot_path) if snapshot_path else None
+    if snap is not None:
+        try:
+            profiles, transcripts, cols = snap.profiles(), snap.transcripts(), snap.market_columns()
+        except SnapshotError:
+            cols = None  # damaged snapshot: read the sources instead
+        finally:
+            snap.close()
+        if cols is not None:
+            return profiles, transcripts, cols if market_columns else pd.DataFrame(cols)
+    import pandas as pd
+    with open(profiles_path, encoding="utf-8") as f:
+        profiles = json.load(f)
+    with open(transcripts_path, encoding="utf-8") as f:
+        transcripts = json.load(f)
+    df = pd.read_csv(market_path)
+    return profiles, transcripts, {c: df[c].tolist() for c in df.columns} if market_columns else df
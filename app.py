@@ -1,4 +1,5 @@
 # app.py
+import hashlib
 import json
 import re
 from datetime import datetime, timezone
@@ -13,9 +14,10 @@ except Exception:
     talent_intelligence_report = None
 
 try:
-    from agents.assessment_designer import generate_assessment
+    from agents.assessment_designer import generate_assessment, load_question_bank, record_exposure, exposure_keys
 except Exception:
     generate_assessment = None
+    load_question_bank = None
 
 try:
     from agents.behavioral import analyze_transcript
@@ -28,6 +30,17 @@ except Exception:
     load_market = None
     summarize = None
 
+try:
+    from agents.snapshot import open_snapshot, SnapshotError
+except Exception:
+    open_snapshot = None
+    SnapshotError = ValueError
+
+try:
+    from agents.profile_index import derive_fields, load_profile_index, source_key
+except Exception:
+    derive_fields = load_profile_index = source_key = None
+
 # -------------------- CONFIG & DATA PATHS --------------------
 DATA_DIR = Path("data")
 DATA_DIR.mkdir(exist_ok=True)
@@ -36,6 +49,10 @@ TRANSCRIPTS_PATH = DATA_DIR / "transcripts.json"
 MARKET_PATH = DATA_DIR / "market_compensation.csv"
 ASSESS_PATH = DATA_DIR / "assessments.json"
 BEHAV_PATH = DATA_DIR / "behavioral_analysis.json"
+QUESTION_BANK_PATH = DATA_DIR / "question_bank.json"
+EXPOSURE_PATH = DATA_DIR / "question_exposure.json"
+SNAPSHOT_PATH = DATA_DIR / "snapshot.bin"
+PROFILE_INDEX_PATH = DATA_DIR / "profile_index.json"
 
 # ensure output files exist (create empty arrays if missing)
 for p in [ASSESS_PATH, BEHAV_PATH]:
@@ -71,98 +88,21 @@ def append_to_json_array(path: Path, entry: dict):
     arr.append(entry)
     safe_write_json_file(path, arr)
 
-def infer_role(profile):
-    if not isinstance(profile, dict):
-        return "Unknown"
-    headline = profile.get("headline")
-    if isinstance(headline, str) and headline.strip():
-        return headline.split("|")[0].strip()
-    linkedin = profile.get("linkedin", {}) or {}
-    exp = linkedin.get("experience") or []
-    if isinstance(exp, list) and exp:
-        title = exp[0].get("title")
-        if title:
-            return title
-    summary = linkedin.get("summary", "")
-    if isinstance(summary, str) and summary:
-        m = re.search(r"is (an|a)\s+([A-Za-z0-9\-\s/]+?)(?:\s+with|\.\s|$)", summary, flags=re.IGNORECASE)
-        if m:
-            return m.group(2).strip()
-    skills = linkedin.get("skills", []) or []
-    if skills:
-        return skills[0]
-    return "Unknown"
-
-def parse_years_from_summary(summary):
-    if not summary or not isinstance(summary, str):
-        return None
-    m = re.search(r"(\d+)\s*-\s*(\d+)\s*years", summary, flags=re.IGNORECASE)
-    if m:
-        try:
-            return float(int(m.group(1)))
-        except Exception:
-            pass
-    m2 = re.search(r"(\d+)\s*years", summary, flags=re.IGNORECASE)
-    if m2:
-        try:
-            return float(int(m2.group(1)))
-        except Exception:
-            pass
-    return None
-
-def compute_experience_years(profile, as_of_date=None):
-    if as_of_date is None:
-        as_of_date = datetime.now()
-    linkedin = profile.get("linkedin", {}) or {}
-    exp = linkedin.get("experience") or []
-    starts = []
-    ends = []
-    for e in exp:
-        s = e.get("start")
-        t = e.get("end")
-        if isinstance(s, str):
-            try:
-                if re.match(r"^\d{4}-\d{2}$", s):
-                    starts.append(datetime.strptime(s, "%Y-%m"))
-                elif re.match(r"^\d{4}$", s):
-                    starts.append(datetime.strptime(s, "%Y"))
-            except Exception:
-                pass
-        if isinstance(t, str):
-            try:
-                if re.match(r"^\d{4}-\d{2}$", t):
-                    ends.append(datetime.strptime(t, "%Y-%m"))
-                elif re.match(r"^\d{4}$", t):
-                    ends.append(datetime.strptime(t, "%Y"))
-            except Exception:
-                pass
-        else:
-            ends.append(as_of_date)
-    if not starts:
-        return None
-    start_dt = min(starts)
-    end_dt = max(ends) if ends else as_of_date
-    months = (end_dt.year - start_dt.year) * 12 + (end_dt.month - start_dt.month)
-    years = months / 12.0
-    return round(years, 1)
-
-def infer_level(profile):
-    linkedin = profile.get("linkedin", {}) or {}
-    summary = linkedin.get("summary", "")
-    y = parse_years_from_summary(summary)
-    if y is None:
-        y = compute_experience_years(profile)
-    if y is None:
-        return "Mid"
-    try:
-        y = float(y)
-        if y < 2:
-            return "Junior"
-        if 2 <= y < 5:
-            return "Mid"
-        return "Senior"
-    except Exception:
-        return "Mid"
+def fallback_derived(profile):
+    """Role/level without the profile index: headline role, level from 'N years' in the summary."""
+    headline = profile.get("headline") if isinstance(profile, dict) else None
+    role = headline.split("|")[0].strip() if isinstance(headline, str) and headline.strip() else "Unknown"
+    summary = ((profile.get("linkedin", {}) or {}).get("summary") if isinstance(profile, dict) else None) or ""
+    m = re.search(r"(\d+)\s*(?:-\s*\d+\s*)?years", summary if isinstance(summary, str) else "", flags=re.IGNORECASE)
+    years = float(m.group(1)) if m else None
+    level = "Mid" if years is None else "Junior" if years < 2 else "Mid" if years < 5 else "Senior"
+    return {"role": role, "level": level, "experience_years": None, "career_summary": None}
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def cached_profile_index(source, month, index_path, _profiles):
+    # reused across reruns; profiles are only hashed when the source (file stat or
+    # uploaded bytes) or the month changes
+    return load_profile_index(_profiles, index_path, source)
 
 # -------------------- PAGE CONFIG --------------------
 st.set_page_config(page_title="Recruitment Assistant", layout="wide")
@@ -173,39 +113,96 @@ with st.sidebar:
     st.header("📂 Data Sources")
 
     profiles_file = st.file_uploader("Upload Candidate Profiles JSON", type=["json"], accept_multiple_files=False)
-    if not profiles_file and PROFILES_PATH.exists():
-        profiles_file = str(PROFILES_PATH)
-
-    profiles = safe_load_json(profiles_file) or []
-    if not isinstance(profiles, list):
-        st.sidebar.error("Profiles JSON must be a list/array of profile objects.")
-        profiles = []
+    uploaded = profiles_file is not None
 
-    # transcripts
-    transcripts = safe_load_json(TRANSCRIPTS_PATH) or {}
+    # binary snapshot (cli.py snapshot) if present and not older than the sources: only its
+    # id list is read up front and just the selected candidate is decoded. A missing,
+    # stale or damaged snapshot falls back to the JSON/CSV files
+    snap = None
+    if open_snapshot:
+        try:
+            snap = open_snapshot(str(PROFILES_PATH), str(TRANSCRIPTS_PATH), str(MARKET_PATH), str(SNAPSHOT_PATH))
+        except Exception:
+            snap = None
+
+    def read_profiles(source):
+        data = safe_load_json(source) or []
+        if not isinstance(data, list):
+            st.sidebar.error("Profiles JSON must be a list/array of profile objects.")
+            data = []
+        return [p for p in data if isinstance(p, dict)]
+
+    # full profile list; stays None on the snapshot path
+    profiles = None
+    if uploaded or snap is None:
+        if not profiles_file and PROFILES_PATH.exists():
+            profiles_file = str(PROFILES_PATH)
+        profiles = read_profiles(profiles_file)
+        ids = [p.get("id", f"no-id-{i}") for i, p in enumerate(profiles)]
+    else:
+        ids = [cid for cid in snap.header["profile_order"] if cid is not None]
 
-    # market data
-    try:
-        if load_market:
-            market_df = load_market(MARKET_PATH)
+    def all_profiles():
+        # the only full decode: called by the profile index when it has to be refreshed
+        if profiles is not None:
+            return profiles
+        try:
+            return [p for p in snap.profiles() if isinstance(p, dict)]
+        except SnapshotError:
+            return read_profiles(str(PROFILES_PATH))
+
+    # derived role/level/experience per profile, recomputed only when a profile's content changes;
+    # uploaded files get an in-memory index so they don't overwrite the persisted one
+    profile_index = None
+    if load_profile_index:
+        if uploaded:
+            source = "upload:" + hashlib.sha1(profiles_file.getvalue()).hexdigest()
+            index_path = None
         else:
-            market_df = pd.read_csv(MARKET_PATH) if Path(MARKET_PATH).exists() else pd.DataFrame()
-    except Exception:
-        market_df = pd.DataFrame()
+            source, index_path = source_key(str(PROFILES_PATH)) or "missing", str(PROFILE_INDEX_PATH)
+        profile_index = cached_profile_index(source, datetime.now().strftime("%Y-%m"), index_path, all_profiles)
 
     st.markdown("---")
     st.subheader("Candidate Selection")
-    if profiles:
-        ids = [p.get("id", f"no-id-{i}") for i, p in enumerate(profiles)]
-        selected_cid = st.selectbox("Choose candidate", ids)
-    else:
-        selected_cid = None
+    selected_cid = st.selectbox("Choose candidate", ids) if ids else None
+
+    # selected candidate's profile and transcript, plus market data
+    profile, transcript, market_df = None, None, None
+    if snap is not None:
+        try:
+            if profiles is None and selected_cid is not None:
+                profile = snap.profile(selected_cid)
+            if selected_cid in snap.header["transcripts"]:
+                transcript = snap.transcript(selected_cid)
+            market_df = snap.market()
+        except SnapshotError:
+            snap = None
+        finally:
+            if snap is not None:
+                snap.close()
+    if snap is None:
+        if profiles is None:
+            profiles = read_profiles(str(PROFILES_PATH))
+        transcripts = safe_load_json(TRANSCRIPTS_PATH) or {}
+        transcript = transcripts.get(selected_cid) if isinstance(transcripts, dict) else None
+        try:
+            if load_market:
+                market_df = load_market(MARKET_PATH)
+            else:
+                market_df = pd.read_csv(MARKET_PATH) if Path(MARKET_PATH).exists() else pd.DataFrame()
+        except Exception:
+            market_df = pd.DataFrame()
+    if profiles is not None:
+        profile = next((p for p in profiles if p.get("id") == selected_cid), profiles[0] if profiles else None)
 
-# ensure selected_cid exists
-if not selected_cid and profiles:
-    selected_cid = profiles[0].get("id")
 # safe profile object
-profile = next((p for p in profiles if p.get("id") == selected_cid), profiles[0] if profiles else {})
+profile = profile or {}
+if not profile:
+    derived = {}
+elif profile_index is not None:
+    derived = profile_index.get(profile.get("id")) or derive_fields(profile)
+else:
+    derived = fallback_derived(profile)
 
 # load saved lists
 saved_assessments = safe_read_json_file(ASSESS_PATH)
@@ -228,17 +225,17 @@ with tab1:
         report = {}
         if talent_intelligence_report:
             try:
-                report = talent_intelligence_report(profile) or {}
+                report = talent_intelligence_report(profile, summary=derived.get("career_summary")) or {}
             except Exception as e:
                 st.warning(f"talent_intelligence_report() failed: {e}")
                 report = {}
 
         # fallback values
-        report.setdefault("role", infer_role(profile))
-        report.setdefault("level", infer_level(profile))
+        report.setdefault("role", derived.get("role"))
+        report.setdefault("level", derived.get("level"))
         report.setdefault("skills", (profile.get("linkedin", {}) or {}).get("skills", []))
         if "experience_years" not in report:
-            exp_y = compute_experience_years(profile)
+            exp_y = derived.get("experience_years")
             if exp_y is not None:
                 report["experience_years"] = exp_y
 
@@ -298,15 +295,21 @@ with tab1:
 # -------------------- TAB 2: Assessment Designer --------------------
 with tab2:
     st.subheader("📝 Assessment Designer")
-    available_roles = sorted({infer_role(p) for p in profiles}) if profiles else ["General"]
-    role_choice = st.selectbox("Role", available_roles, index=0 if infer_role(profile) in available_roles else 0)
-    inferred_level = infer_level(profile)
+    if profile_index is not None:
+        available_roles = profile_index.roles() or ["General"]
+    else:
+        available_roles = sorted({fallback_derived(p)["role"] for p in profiles or []}) or ["General"]
+    role_choice = st.selectbox("Role", available_roles, index=available_roles.index(derived.get("role")) if derived.get("role") in available_roles else 0)
+    inferred_level = derived.get("level")
     level_choice = st.selectbox("Level", ["Junior", "Mid", "Senior"], index=["Junior","Mid","Senior"].index(inferred_level) if inferred_level in ["Junior","Mid","Senior"] else 1)
 
     package = {}
     if generate_assessment:
         try:
-            package = generate_assessment(profile, role=role_choice, level=level_choice) or {}
+            bank = load_question_bank(str(QUESTION_BANK_PATH)) if load_question_bank else None
+            # exposure is only recorded when the package is saved, not on every rerun
+            package = generate_assessment(profile, role=role_choice, level=level_choice, bank=bank,
+                                          ledger_path=str(EXPOSURE_PATH), record=False) or {}
         except Exception as e:
             st.warning(f"generate_assessment() failed: {e}")
             package = {}
@@ -347,6 +350,8 @@ with tab2:
             "seed": None
         }
         append_to_json_array(ASSESS_PATH, entry)
+        if package.get("question_ids"):
+            record_exposure(exposure_keys(profile, None), package["question_ids"], str(EXPOSURE_PATH))
         st.success(f"Saved assessment for {selected_cid} to {ASSESS_PATH}")
         # refresh saved_assessments in-memory
         saved_assessments = safe_read_json_file(ASSESS_PATH)
@@ -371,7 +376,7 @@ with tab2:
 # -------------------- TAB 3: Behavioral Analyzer --------------------
 with tab3:
     st.subheader("🧠 Behavioral & Culture Fit")
-    lines = transcripts.get(selected_cid, ["(no transcript provided)"]) if isinstance(transcripts, dict) else ["(no transcript provided)"]
+    lines = transcript if transcript is not None else ["(no transcript provided)"]
     st.markdown("#### Transcript / Notes")
     for l in lines:
         st.write(l)
@@ -459,7 +464,7 @@ with tab4:
         if isinstance(market_df, pd.DataFrame) and 'role' in market_df.columns:
             market_roles = sorted(market_df['role'].dropna().unique().tolist())
         else:
-            market_roles = available_roles if profiles else ["General"]
+            market_roles = available_roles if ids else ["General"]
         mrole = st.selectbox("Role (Market)", market_roles)
 
         if isinstance(market_df, pd.DataFrame) and 'level' in market_df.columns:
@@ -0,0 +1,111 @@
+from __future__ import annotations
+import argparse, json, os, pathlib, statistics, subprocess, sys, tempfile, time
+import urllib.request
+from agents.snapshot import build_snapshot
+from loadtest import _free_port
+
+ROOT = pathlib.Path(__file__).resolve().parent
+
+# Each row starts a fresh interpreter on a real entry point, once against the
+# JSON/CSV sources and once against the snapshot:
+#   cli.py         wall time of the whole run, exit included
+#   service start  time until /health answers (teardown is irrelevant for a server)
+#   app session    first script run of a new app.py session (streamlit's AppTest), in-process
+def entry_points(p, t, m, s, cid, tmp):
+    data = ["--profiles", p, "--transcripts", t, "--market", m]
+    cli = [sys.executable, "cli.py", "--candidate-id", cid, *data, "--index", os.path.join(tmp, "cli_index.json"),
+           "--exposure-ledger", os.path.join(tmp, "exposure.json"), "--outdir", os.path.join(tmp, "out")]
+    svc = [sys.executable, "service.py", *data, "--index", os.path.join(tmp, "svc_index.json"), "--exposure-ledger", ""]
+    # app.py reads fixed paths under ./data, so each variant gets its own working directory
+    app = ("import time; from streamlit.testing.v1 import AppTest; at = AppTest.from_file({!r}, default_timeout=300); "
+           "t0 = time.perf_counter(); at.run(); assert not at.exception, at.exception; print(time.perf_counter() - t0)")
+    app_cmd = [sys.executable, "-c", app.format(str(ROOT / "app.py"))]
+    return {
+        "cli.py": (time_run, cli + ["--no-snapshot"], cli + ["--snapshot", s]),
+        "service start": (time_ready, svc + ["--snapshot", ""], svc + ["--snapshot", s]),
+        "app session": (time_reported, (app_cmd, app_dir(tmp, "app_json", p, t, m, False)),
+                        (app_cmd, app_dir(tmp, "app_snap", p, t, m, True))),
+    }
+
+def app_dir(tmp, name, p, t, m, snapshot):
+    data = os.path.join(tmp, name, "data")
+    os.makedirs(data)
+    for src, dst in ((p, "synthetic_profiles.json"), (t, "transcripts.json"), (m, "market_compensation.csv"),
+                     (str(ROOT / "data" / "question_bank.json"), "question_bank.json")):
+        os.symlink(os.path.abspath(src), os.path.join(data, dst))
+    if snapshot:
+        # built from the app's own data paths, as `cli.py snapshot` would be
+        build_snapshot(*(os.path.join(data, f) for f in ("synthetic_profiles.json", "transcripts.json",
+                                                        "market_compensation.csv", "snapshot.bin")))
+    return os.path.dirname(data)
+
+def scale_data(profiles_path: str, transcripts_path: str, factor: int, outdir: str):
+    """Write copies of the profiles/transcripts with factor x as many candidates."""
+    profiles = json.load(open(profiles_path))
+    transcripts = json.load(open(transcripts_path))
+    big_p, big_t = [], {}
+    for i in range(factor):
+        for p in profiles:
+            q = dict(p, id=f"{p['id']}-{i}")
+            big_p.append(q)
+            if p['id'] in transcripts:
+                big_t[q['id']] = transcripts[p['id']]
+    pp, tp = os.path.join(outdir, "profiles.json"), os.path.join(outdir, "transcripts.json")
+    json.dump(big_p, open(pp, "w"))
+    json.dump(big_t, open(tp, "w"))
+    return pp, tp, big_p[-1]['id']
+
+def time_run(cmd) -> float:
+    t0 = time.perf_counter()
+    subprocess.run(cmd, cwd=ROOT, check=True, capture_output=True)
+    return time.perf_counter() - t0
+
+def time_ready(cmd) -> float:
+    port = _free_port()
+    t0 = time.perf_counter()
+    proc = subprocess.Popen(cmd + ["--port", str(port)], cwd=ROOT, stdout=subprocess.DEVNULL)
+    try:
+        while True:
+            try:
+                urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1).read()
+                return time.perf_counter() - t0
+            except OSError:
+                if proc.poll() is not None:
+                    raise SystemExit("service exited during start-up")
+                time.sleep(0.005)
+    finally:
+        proc.terminate()
+        proc.wait()
+
+def time_reported(cmd_cwd) -> float:
+    cmd, cwd = cmd_cwd
+    env = dict(os.environ, PYTHONPATH=str(ROOT))
+    out = subprocess.run(cmd, cwd=cwd, env=env, check=True, capture_output=True, text=True)
+    return float(out.stdout.strip().splitlines()[-1])
+
+def main():
+    ap = argparse.ArgumentParser(description="Compare cold start of cli.py, the service and an app session: JSON/CSV vs snapshot.")
+    ap.add_argument('--profiles', default='data/synthetic_profiles.json')
+    ap.add_argument('--transcripts', default='data/transcripts.json')
+    ap.add_argument('--market', default='data/market_compensation.csv')
+    ap.add_argument('--scale', type=int, default=1000, help='replicate the candidates this many times')
+    ap.add_argument('--runs', type=int, default=5)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        p, t, cid = scale_data(args.profiles, args.transcripts, args.scale, tmp)
+        m = os.path.abspath(args.market)
+        s = os.path.join(tmp, "snapshot.bin")
+        build_snapshot(p, t, m, s)
+        print(f"candidates={args.scale * len(json.load(open(args.profiles)))} "
+              f"json={os.path.getsize(p) + os.path.getsize(t)}B snapshot={os.path.getsize(s)}B runs={args.runs}")
+        print(f"{'entry point':<16} {'json/csv ms':>12} {'snapshot ms':>12}")
+        for name, (timer, src_cmd, snap_cmd) in entry_points(p, t, m, s, cid, tmp).items():
+            # one untimed run each so persisted indexes are warm, as in steady-state use
+            timer(src_cmd); timer(snap_cmd)
+            src = statistics.median(timer(src_cmd) for _ in range(args.runs))
+            snap = statistics.median(timer(snap_cmd) for _ in range(args.runs))
+            print(f"{name:<16} {src*1000:>12.1f} {snap*1000:>12.1f}")
+
+if __name__ == '__main__':
+    main()
@@ -1,33 +1,101 @@
 from __future__ import annotations
-import json, argparse, os, pathlib
+import json, argparse, os, pathlib, sys
 from agents.profiler import talent_intelligence_report
-from agents.assessment_designer import generate_assessment
+from agents.assessment_designer import generate_assessment, load_question_bank
 from agents.behavioral import analyze_transcript
-from agents.market_intel import load_market, summarize
+from agents.market_intel import load_market, summarize, summarize_columns
+from agents.snapshot import build_snapshot, open_snapshot, load_profiles, SnapshotError
+from agents.profile_index import ProfileIndex, load_profile_index, source_key
+
+def snapshot_main(argv):
+    ap = argparse.ArgumentParser(prog='cli.py snapshot', description='Compile the data files into a binary snapshot for fast start-up.')
+    ap.add_argument('--profiles', default='data/synthetic_profiles.json')
+    ap.add_argument('--transcripts', default='data/transcripts.json')
+    ap.add_argument('--market', default='data/market_compensation.csv')
+    ap.add_argument('--out', default='data/snapshot.bin')
+    args = ap.parse_args(argv)
+    header = build_snapshot(args.profiles, args.transcripts, args.market, args.out)
+    print(f"Snapshot of {len(header['profiles'])} profiles written to:", args.out)
+
+def list_main(argv):
+    ap = argparse.ArgumentParser(prog='cli.py list', description='List candidates by inferred role and level.')
+    ap.add_argument('--role', default=None)
+    ap.add_argument('--level', default=None, choices=['Junior','Mid','Senior'])
+    ap.add_argument('--profiles', default='data/synthetic_profiles.json')
+    ap.add_argument('--transcripts', default='data/transcripts.json')
+    ap.add_argument('--market', default='data/market_compensation.csv')
+    ap.add_argument('--snapshot', default='data/snapshot.bin')
+    ap.add_argument('--index', default='data/profile_index.json')
+    args = ap.parse_args(argv)
+    # profiles are only loaded when the persisted index is stale for the profiles file
+    index = load_profile_index(lambda: load_profiles(args.profiles, args.transcripts, args.market, args.snapshot),
+                               args.index, source_key(args.profiles))
+    for cid in index.filter(role=args.role, level=args.level):
+        e = index.get(cid)
+        print(f"{cid}\t{e['role']}\t{e['level']}\t{e['experience_years']}")
 
 def main():
+    if sys.argv[1:2] == ['snapshot']:
+        return snapshot_main(sys.argv[2:])
+    if sys.argv[1:2] == ['list']:
+        return list_main(sys.argv[2:])
     ap = argparse.ArgumentParser()
     ap.add_argument('--candidate-id', required=True)
     ap.add_argument('--role', default='AI Engineer')
-    ap.add_argument('--level', default='Mid', choices=['Junior','Mid','Senior'])
+    ap.add_argument('--level', default=None, choices=['Junior','Mid','Senior'], help='defaults to the inferred level')
     ap.add_argument('--profiles', default='data/synthetic_profiles.json')
     ap.add_argument('--transcripts', default='data/transcripts.json')
     ap.add_argument('--market', default='data/market_compensation.csv')
+    ap.add_argument('--snapshot', default='data/snapshot.bin')
+    ap.add_argument('--no-snapshot', action='store_true', help='always parse the JSON/CSV sources')
+    ap.add_argument('--index', default='data/profile_index.json')
+    ap.add_argument('--question-bank', default='data/question_bank.json')
+    ap.add_argument('--exposure-ledger', default='data/question_exposure.json')
+    ap.add_argument('--cohort', default=None, help='avoid repeating questions across this cohort')
     ap.add_argument('--outdir', default='outputs')
     args = ap.parse_args()
 
-    profiles = json.load(open(args.profiles))
-    transcripts = json.load(open(args.transcripts))
-    market_df = load_market(args.market)
+    snap = None if args.no_snapshot else open_snapshot(args.profiles, args.transcripts, args.market, args.snapshot)
+    market_cols = None
+    if snap is not None:
+        # decode only the selected candidate from the snapshot's offset table; market data
+        # stays column lists so this path never imports pandas
+        try:
+            profile = snap.profile(args.candidate_id)
+            transcript = snap.transcript(args.candidate_id)
+            market_cols = snap.market_columns()
+        except SnapshotError:
+            snap, market_cols = None, None  # damaged snapshot: fall back to the sources
+        finally:
+            if snap is not None:
+                snap.close()
+    if snap is None:
+        profiles = json.load(open(args.profiles))
+        transcripts = json.load(open(args.transcripts))
+        market_df = load_market(args.market)
+        profile = next((p for p in profiles if p['id']==args.candidate_id), None)
+        transcript = transcripts.get(args.candidate_id, [])
+    bank = load_question_bank(args.question_bank)
 
-    profile = next((p for p in profiles if p['id']==args.candidate_id), None)
     if not profile:
         raise SystemExit(f"Candidate {args.candidate_id} not found.")
 
-    report = talent_intelligence_report(profile)
-    package = generate_assessment(report, role=args.role, level=args.level)
-    behavior = analyze_transcript(transcripts.get(args.candidate_id, []))
-    market = summarize(market_df, role=args.role, region='Bangalore', level=args.level)
+    index = ProfileIndex(args.index)
+    derived = index.entry_for(profile)
+    try:
+        index.save()
+    except OSError:
+        pass  # read-only location: the index is only a cache
+    args.level = args.level or derived['level']
+
+    report = talent_intelligence_report(profile, summary=derived['career_summary'])
+    package = generate_assessment(report, role=args.role, level=args.level, bank=bank,
+                                  ledger_path=args.exposure_ledger, cohort=args.cohort)
+    behavior = analyze_transcript(transcript)
+    if market_cols is not None:
+        market = summarize_columns(market_cols, role=args.role, region='Bangalore', level=args.level)
+    else:
+        market = summarize(market_df, role=args.role, region='Bangalore', level=args.level)
 
     os.makedirs(args.outdir, exist_ok=True)
     base = pathlib.Path(args.outdir)/f"{args.candidate_id}_{args.role.replace(' ','_')}_{args.level}"
@@ -0,0 +1,118 @@
+from __future__ import annotations
+import argparse, json, os, pathlib, socket, subprocess, sys, tempfile, threading, time
+import urllib.request
+from collections import defaultdict
+
+# Request mix cycled by every client thread.
+def request_mix(candidate_ids):
+    reqs = []
+    for cid in candidate_ids:
+        reqs += [
+            ("/profile", {"candidate_id": cid}),
+            ("/behavior", {"candidate_id": cid}),
+            ("/assessment", {"candidate_id": cid, "role": "AI Engineer", "level": "Mid"}),
+        ]
+    for level in ("Junior", "Mid", "Senior"):
+        reqs.append(("/market", {"role": "AI Engineer", "region": "Bangalore", "level": level}))
+    return reqs
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def start_service(args, ledger_path: str):
+    port = _free_port()
+    root = pathlib.Path(__file__).resolve().parent
+    cmd = [sys.executable, str(root / "service.py"), "--port", str(port), "--workers", str(args.workers),
+           "--batch-window-ms", str(args.batch_window_ms), "--exposure-ledger", ledger_path]
+    proc = subprocess.Popen(cmd, cwd=root, stdout=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{port}"
+    for _ in range(300):
+        try:
+            urllib.request.urlopen(url + "/health", timeout=1).read()
+            return proc, url
+        except OSError:
+            if proc.poll() is not None:
+                raise SystemExit("service exited during start-up")
+            time.sleep(0.1)
+    proc.terminate()
+    raise SystemExit("service did not become healthy")
+
+def post(url: str, path: str, body: dict) -> int:
+    req = urllib.request.Request(url + path, data=json.dumps(body).encode("utf-8"),
+                                 headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(req, timeout=30) as r:
+        r.read()
+        return r.status
+
+def pct(xs, p):
+    xs = sorted(xs)
+    return xs[min(len(xs) - 1, int(round(p / 100 * (len(xs) - 1))))]
+
+def main():
+    ap = argparse.ArgumentParser(description="Load-test the local agent service and report latency percentiles.")
+    ap.add_argument('--url', default=None, help='target a running service instead of starting one')
+    ap.add_argument('--concurrency', type=int, default=16)
+    ap.add_argument('--duration', type=float, default=10.0, help='seconds')
+    ap.add_argument('--workers', type=int, default=4)
+    ap.add_argument('--batch-window-ms', type=float, default=5.0)
+    ap.add_argument('--profiles', default='data/synthetic_profiles.json')
+    args = ap.parse_args()
+
+    ids = [p["id"] for p in json.load(open(args.profiles))]
+    mix = request_mix(ids)
+    proc = None
+    tmp = tempfile.TemporaryDirectory()
+    url = args.url
+    if url is None:
+        proc, url = start_service(args, os.path.join(tmp.name, "exposure.json"))
+
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+    lock = threading.Lock()
+    stop = time.monotonic() + args.duration
+
+    def client(offset: int):
+        i = offset
+        while time.monotonic() < stop:
+            path, body = mix[i % len(mix)]
+            i += 1
+            t0 = time.perf_counter()
+            try:
+                post(url, path, body)
+                ok = True
+            except OSError:
+                ok = False
+            dt = time.perf_counter() - t0
+            with lock:
+                if ok:
+                    latencies[path].append(dt)
+                else:
+                    errors[path] += 1
+
+    try:
+        started = time.monotonic()
+        threads = [threading.Thread(target=client, args=(k,)) for k in range(args.concurrency)]
+        for t in threads: t.start()
+        for t in threads: t.join()
+        elapsed = time.monotonic() - started
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+        tmp.cleanup()
+
+    total = [x for xs in latencies.values() for x in xs]
+    if not total:
+        raise SystemExit("no successful requests")
+    print(f"concurrency={args.concurrency} duration={elapsed:.1f}s requests={len(total)} "
+          f"errors={sum(errors.values())} rps={len(total)/elapsed:.1f}")
+    print(f"{'endpoint':<12} {'count':>7} {'p50 ms':>8} {'p99 ms':>8}")
+    for path in sorted(latencies):
+        xs = latencies[path]
+        print(f"{path:<12} {len(xs):>7} {pct(xs, 50)*1000:>8.1f} {pct(xs, 99)*1000:>8.1f}")
+    print(f"{'all':<12} {len(total):>7} {pct(total, 50)*1000:>8.1f} {pct(total, 99)*1000:>8.1f}")
+
+if __name__ == '__main__':
+    main()
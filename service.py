@@ -0,0 +1,294 @@
+from __future__ import annotations
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from concurrent.futures import Future, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import argparse, json, os, sys, threading, time
+from agents.profiler import talent_intelligence_report
+from agents.assessment_designer import (generate_assessment, load_question_bank, load_exposure, save_exposure,
+                                       merge_exposure, note_exposure, exposure_keys)
+from agents.behavioral import analyze_transcripts
+from agents.market_intel import summarize_columns
+from agents.snapshot import load_data
+from agents.profile_index import load_profile_index, source_key
+
+class MicroBatcher:
+    """Collects calls for one agent over a short window and runs them as a single batch on the pool.
+
+    fn takes a list of items and returns a list of results in the same order; a result
+    that is an Exception fails only that item's future. If fn raises, the batch is
+    retried item by item so one bad request cannot fail the others -- unless retry is
+    False, for stateful fns that must not be replayed; then every item fails.
+    """
+
+    def __init__(self, fn: Callable[[List[Any]], List[Any]], pool: ThreadPoolExecutor,
+                 window: float = 0.005, max_batch: int = 64, retry: bool = True):
+        self.fn, self.pool, self.window, self.max_batch, self.retry = fn, pool, window, max_batch, retry
+        self._pending: List[Tuple[Any, Future]] = []
+        self._cv = threading.Condition()
+        threading.Thread(target=self._collect, daemon=True).start()
+
+    def submit(self, item: Any) -> Future:
+        fut: Future = Future()
+        with self._cv:
+            self._pending.append((item, fut))
+            self._cv.notify()
+        return fut
+
+    def _collect(self) -> None:
+        while True:
+            with self._cv:
+                while not self._pending:
+                    self._cv.wait()
+                deadline = time.monotonic() + self.window
+                while len(self._pending) < self.max_batch:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cv.wait(remaining)
+                batch, self._pending = self._pending[:self.max_batch], self._pending[self.max_batch:]
+            self.pool.submit(self._dispatch, batch)
+
+    def _dispatch(self, batch: List[Tuple[Any, Future]]) -> None:
+        items = [item for item, _ in batch]
+        try:
+            results = self.fn(items)
+        except Exception as e:
+            if not self.retry:
+                for _, fut in batch:
+                    fut.set_exception(e)
+                return
+            # isolate the failing request: rerun the batch one item at a time
+            results = []
+            for item in items:
+                try:
+                    results.append(self.fn([item])[0])
+                except Exception as e:
+                    results.append(e)
+        for (_, fut), res in zip(batch, results):
+            if isinstance(res, Exception):
+                fut.set_exception(res)
+            else:
+                fut.set_result(res)
+
+def _dedup(fn: Callable[[Any], Any], items: List[Any]) -> List[Any]:
+    # identical requests inside one batch are computed once; a failing item yields its
+    # exception in place so it does not fail the rest of the batch
+    cache: Dict[Any, Any] = {}
+    for i in items:
+        if i not in cache:
+            try:
+                cache[i] = fn(i)
+            except Exception as e:
+                cache[i] = e
+    return [cache[i] for i in items]
+
+LEVELS = ("Junior", "Mid", "Senior")
+
+def _file_stat(path: str) -> Optional[Tuple[int, int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+def _validate(body: Dict[str, Any], fields: Tuple[str, ...]) -> str:
+    """Error message for the first malformed field in body, or '' if all are valid."""
+    for name in fields:
+        value = body.get(name)
+        if value is None and name != "candidate_id":
+            continue
+        if not isinstance(value, str):
+            return f"'{name}' must be a string."
+        if name == "level" and value not in LEVELS:
+            return f"'level' must be one of {', '.join(LEVELS)}."
+    return ""
+
+class AgentService:
+    """Keeps profiles, transcripts, market data and the question bank resident and batches agent calls."""
+
+    def __init__(self, args: argparse.Namespace):
+        # market data as column lists: with a fresh snapshot the service never imports pandas
+        profiles, self.transcripts, self.market = load_data(args.profiles, args.transcripts, args.market,
+                                                            args.snapshot, market_columns=True)
+        self.profiles = {p.get("id"): p for p in profiles}
+        self.index = load_profile_index(profiles, args.index, source_key(args.profiles))
+        self.bank = load_question_bank(args.question_bank)
+        self.ledger_path = args.exposure_ledger or None
+        # exposure ledger stays resident; it is re-read only after another process (CLI, app)
+        # wrote the file, and merged back once per assessment batch
+        self.ledger = load_exposure(self.ledger_path) if self.ledger_path else None
+        self._ledger_stat = _file_stat(self.ledger_path) if self.ledger_path else None
+        self._unsaved: List[Tuple[List[str], List[str]]] = []  # (keys, question ids) not yet on disk
+        self._ledger_lock = threading.Lock()
+        self.pool = ThreadPoolExecutor(max_workers=args.workers)
+        window = args.batch_window_ms / 1000.0
+        self.batchers = {
+            name: MicroBatcher(fn, self.pool, window, args.max_batch, retry=name != "assessment")
+            for name, fn in (("profile", self._profiles), ("assessment", self._assessments),
+                             ("behavior", self._behaviors), ("market", self._markets))
+        }
+
+    def _profiles(self, ids: List[str]) -> List[Dict[str, Any]]:
+        return _dedup(lambda cid: talent_intelligence_report(
+            self.profiles[cid], summary=self.index.get(cid)["career_summary"]), ids)
+
+    def _assessments(self, reqs: List[Tuple[str, str, str, Any]]) -> List[Any]:
+        # updates the ledger, so failures are isolated here rather than by replaying the batch
+        ids = sorted({r[0] for r in reqs})
+        reports = dict(zip(ids, self._profiles(ids)))
+        results: List[Any] = []
+        with self._ledger_lock:
+            if self.ledger is not None:
+                self._refresh_ledger()
+            for cid, role, level, cohort in reqs:
+                try:
+                    if isinstance(reports[cid], Exception):
+                        raise reports[cid]
+                    package = generate_assessment(reports[cid], role=role, level=level, bank=self.bank,
+                                                  cohort=cohort, ledger=self.ledger)
+                    keys = exposure_keys(reports[cid], cohort)
+                    if self.ledger is not None and keys and package.get("question_ids"):
+                        self._unsaved.append((keys, package["question_ids"]))
+                    results.append(package)
+                except Exception as e:
+                    results.append(e)
+            if self._unsaved:
+                self._save_ledger()
+        return results
+
+    def _refresh_ledger(self) -> None:
+        # another process wrote the file: reload it and reapply picks not yet saved
+        stat = _file_stat(self.ledger_path)
+        if stat == self._ledger_stat:
+            return
+        try:
+            ledger = load_exposure(self.ledger_path)
+        except (OSError, ValueError) as e:
+            print(f"exposure ledger not reloaded: {e}", file=sys.stderr, flush=True)
+            return
+        for keys, question_ids in self._unsaved:
+            note_exposure(ledger, keys, question_ids)
+        self.ledger, self._ledger_stat = ledger, stat
+
+    def _save_ledger(self) -> None:
+        try:
+            if _file_stat(self.ledger_path) != self._ledger_stat:
+                self.ledger = merge_exposure(self._unsaved, self.ledger_path)
+            else:
+                save_exposure(self.ledger, self.ledger_path)
+        except (OSError, ValueError) as e:
+            # keep serving: the picks stay in memory and are written with a later batch
+            print(f"exposure ledger not saved: {e}", file=sys.stderr, flush=True)
+            return
+        self._ledger_stat = _file_stat(self.ledger_path)
+        self._unsaved = []
+
+    def _behaviors(self, ids: List[str]) -> List[Dict[str, Any]]:
+        uniq = sorted(set(ids))
+        by_id = dict(zip(uniq, analyze_transcripts([self.transcripts.get(cid, []) for cid in uniq])))
+        return [by_id[cid] for cid in ids]
+
+    def _markets(self, keys: List[Tuple[str, str, str]]) -> List[Dict[str, Any]]:
+        return _dedup(lambda k: summarize_columns(self.market, role=k[0], region=k[1], level=k[2]), keys)
+
+    def handle(self, path: str, body: Dict[str, Any]) -> Tuple[int, Any]:
+        fields = {"/profile": ("candidate_id",), "/behavior": ("candidate_id",),
+                  "/assessment": ("candidate_id", "role", "level", "cohort"),
+                  "/market": ("role", "region", "level"), "/candidates": ("role", "level")}
+        if path not in fields:
+            return 404, {"error": f"Unknown endpoint {path}."}
+        error = _validate(body, fields[path])
+        if error:
+            return 400, {"error": error}
+        if path == "/candidates":
+            ids = self.index.filter(role=body.get("role"), level=body.get("level"))
+            return 200, [{"id": cid, **{k: self.index.get(cid)[k] for k in ("role", "level", "experience_years")}}
+                         for cid in ids]
+        if path == "/market":
+            key = (body.get("role") or "AI Engineer", body.get("region") or "Bangalore", body.get("level") or "Mid")
+            return 200, self.batchers["market"].submit(key).result()
+        cid = body["candidate_id"]
+        if cid not in self.profiles:
+            return 404, {"error": f"Candidate {cid} not found."}
+        if path == "/profile":
+            return 200, self.batchers["profile"].submit(cid).result()
+        if path == "/behavior":
+            return 200, self.batchers["behavior"].submit(cid).result()
+        req = (cid, body.get("role") or "AI Engineer", body.get("level") or self.index.get(cid)["level"], body.get("cohort"))
+        return 200, self.batchers["assessment"].submit(req).result()
+
+class AgentHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # default backlog of 5 drops SYNs under concurrent clients and adds 1s retransmit stalls
+    request_queue_size = 128
+
+def make_handler(service: AgentService, verbose: bool = False):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _send(self, status: int, payload: Any) -> None:
+            data = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            if self.path == "/health":
+                self._send(200, {"status": "ok", "candidates": len(service.profiles)})
+            else:
+                self._send(404, {"error": f"Unknown endpoint {self.path}."})
+
+        def do_POST(self):
+            try:
+                n = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(n) or b"{}")
+            except ValueError:
+                body = None
+            if not isinstance(body, dict):
+                return self._send(400, {"error": "Request body must be a JSON object."})
+            try:
+                status, payload = service.handle(self.path, body)
+            except Exception as e:
+                status, payload = 500, {"error": str(e)}
+            self._send(status, payload)
+
+        def log_message(self, format, *args):
+            if verbose:
+                super().log_message(format, *args)
+
+    return Handler
+
+def parse_args(argv=None) -> argparse.Namespace:
+    ap = argparse.ArgumentParser(description='Serve the recruitment agents over local HTTP.')
+    ap.add_argument('--host', default='127.0.0.1')
+    ap.add_argument('--port', type=int, default=8765)
+    ap.add_argument('--workers', type=int, default=4)
+    ap.add_argument('--batch-window-ms', type=float, default=5.0)
+    ap.add_argument('--max-batch', type=int, default=64)
+    ap.add_argument('--profiles', default='data/synthetic_profiles.json')
+    ap.add_argument('--transcripts', default='data/transcripts.json')
+    ap.add_argument('--market', default='data/market_compensation.csv')
+    ap.add_argument('--snapshot', default='data/snapshot.bin')
+    ap.add_argument('--index', default='data/profile_index.json')
+    ap.add_argument('--question-bank', default='data/question_bank.json')
+    ap.add_argument('--exposure-ledger', default='data/question_exposure.json', help="'' disables the ledger")
+    ap.add_argument('--verbose', action='store_true')
+    return ap.parse_args(argv)
+
+def main():
+    args = parse_args()
+    service = AgentService(args)
+    server = AgentHTTPServer((args.host, args.port), make_handler(service, args.verbose))
+    print(f"Serving {len(service.profiles)} candidates on http://{args.host}:{args.port}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.pool.shutdown(wait=False)
+
+if __name__ == '__main__':
+    main()